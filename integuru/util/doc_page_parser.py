@@ -1,101 +1,312 @@
 from typing import Optional, Tuple, Dict, Any, Union, List, Set
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import aiohttp
+import asyncio
+import atexit
+import cachetools
+import orjson
 import re
+import threading
 import yaml
 import json
 from urllib.parse import urljoin, urlparse
+
+# LibYAML's C loader is several times faster than the pure-Python default
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 from dataclasses import dataclass
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+
+# Optional: selectolax (lexbor engine) parses HTML far faster than
+# BS4+lxml and is enough for the simple doc-type probes.
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 
 # Playwright for handling complex JS-driven pages
 from playwright.sync_api import sync_playwright
 from playwright.sync_api._generated import Page, Browser
 
+# Precompiled patterns for the hot paths; compiling per call is wasted work
+# when crawling many pages.
+_RE_SWAGGER_UI = re.compile(r'swagger-ui', re.IGNORECASE)
+_RE_REDOC = re.compile(r'redoc', re.IGNORECASE)
+_RE_POSTMAN_HREF = re.compile(r'getpostman|documenter\.getpostman\.com', re.IGNORECASE)
+_RE_POSTMAN_ALT = re.compile(r'Run in Postman', re.IGNORECASE)
+_RE_NAV_CLASS = re.compile(r'sidebar|menu|navigation', re.IGNORECASE)
+_RE_CONTENT_CLASS = re.compile(r'content|main|documentation', re.IGNORECASE)
+_RE_SPEC_PATH = re.compile(
+    r'(?:swagger\.json|openapi\.(?:json|ya?ml)|postman_collection\.json)',
+    re.IGNORECASE)
+_RE_COMBINED_SPEC = re.compile(
+    r'https?://[^"\'<>\s]+(?:swagger\.json|openapi\.(?:json|ya?ml)|postman_collection\.json)',
+    re.IGNORECASE)
+# XPath equivalents of the BeautifulSoup walks below; lxml evaluates these
+# in C with a single tree traversal.
+_XP_CLASS = ("translate(@class,'ABCDEFGHIJKLMNOPQRSTUVWXYZ',"
+             "'abcdefghijklmnopqrstuvwxyz')")
+_XPATH_SIDEBAR_LINKS = (
+    "//*[self::aside or self::div or self::nav]"
+    "[contains({c},'sidebar') or contains({c},'menu')"
+    " or contains({c},'navigation')]//a/@href".format(c=_XP_CLASS))
+_XPATH_ALL_LINKS = ("//nav//a/@href | //div//a/@href"
+                    " | //main//a/@href | //article//a/@href")
+_XPATH_SPEC_CANDIDATES = "//script/@src | //link/@href | //a/@href"
+_XPATH_MAIN_CONTENT = (
+    "//*[self::main or self::article or self::div]"
+    "[contains({c},'content') or contains({c},'main')"
+    " or contains({c},'documentation')]".format(c=_XP_CLASS))
+
+# Upper bound on extracted page text; callers only ever skim it, and an
+# unbounded get_text over a big documentation page is pure allocator churn
+_MAX_CONTENT_BYTES = 65536
+
+_RE_SPEC_ANY = re.compile(
+    r'''(?:src|href)\s*=\s*["']([^"']*(?:swagger\.json|openapi\.(?:json|ya?ml)|postman_collection\.json)[^"']*)["']''',
+    re.IGNORECASE)
+
+# Crawl bounds: number of in-flight fetches and a cap on total pages so a
+# badly linked doc site cannot trigger a runaway crawl.
+_ASYNC_FETCH_LIMIT = 16
+_MAX_CRAWL_PAGES = 200
+
+# Caches so re-crawls and the Playwright retry path do not refetch and
+# reparse the same URLs. Spec files rarely change, so they sit in a plain
+# LRU; HTML freshness matters more, so pages expire after ten minutes.
+# Only successful fetches are cached, and oversized specs are skipped so a
+# single huge download cannot pin the cache.
+_SPEC_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+# Hard ceiling on spec downloads; anything bigger is almost certainly not
+# an API spec and would otherwise be buffered into memory whole.
+_SPEC_MAX_BYTES = 32 * 1024 * 1024
+_SPEC_CHUNK_BYTES = 65536
+_SPEC_CACHE: "cachetools.LRUCache" = cachetools.LRUCache(maxsize=256)
+_SPEC_CACHE_LOCK = threading.Lock()
+_HTML_CACHE: "cachetools.TTLCache" = cachetools.TTLCache(maxsize=512, ttl=600)
+_HTML_CACHE_LOCK = threading.Lock()
+
+def clear_cache() -> None:
+    """Drop all cached spec and HTML responses, forcing fresh fetches."""
+    with _SPEC_CACHE_LOCK:
+        _SPEC_CACHE.clear()
+    with _HTML_CACHE_LOCK:
+        _HTML_CACHE.clear()
+
+# Shared HTTP session so crawls reuse TCP/TLS connections to the same host
+# instead of paying the handshake cost on every request.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+)
+_SESSION.mount('http://', _adapter)
+_SESSION.mount('https://', _adapter)
+# Only advertise encodings requests can always decode; offering br without
+# a brotli decoder installed would yield undecoded bodies
+_SESSION.headers['Accept-Encoding'] = 'gzip, deflate'
+
+def _make_soup(html_content: str) -> BeautifulSoup:
+    """
+    Build a BeautifulSoup tree using the fast lxml parser.
+
+    Falls back to the stdlib html.parser for fragments lxml rejects.
+    """
+    try:
+        return BeautifulSoup(html_content, 'lxml')
+    except Exception:
+        return BeautifulSoup(html_content, 'html.parser')
+
+def _as_soup(html_content: Union[str, BeautifulSoup]) -> BeautifulSoup:
+    """Return the argument if it is already a soup, otherwise parse it."""
+    if isinstance(html_content, BeautifulSoup):
+        return html_content
+    return _make_soup(html_content)
+
 @dataclass
 class DocTypeResult:
     doc_type: str
     confidence: float
 
-@dataclass 
+@dataclass
 class DocPage:
     url: str
     title: str
     content: str
     spec: Optional[Dict[str, Any]] = None
+    # Raw spec source, kept so JSON specs can be served without a
+    # re-serialization round trip
+    spec_text: Optional[str] = None
+    spec_is_json: bool = False
 
-def detect_documentation_type(html_content: str) -> DocTypeResult:
+def detect_documentation_type(html_content: Union[str, BeautifulSoup]) -> DocTypeResult:
     """
     Detect whether the given HTML content is from:
       - OpenAPI/Swagger
       - Postman
       - Unknown/Other
 
+    Accepts either raw HTML or an already-parsed BeautifulSoup tree.
+
     Returns: DocTypeResult with doc_type and confidence score
     """
     if not html_content:
         return DocTypeResult("unknown", 0.0)
 
-    soup = BeautifulSoup(html_content, 'html.parser')
-    confidence = 0.0
+    if isinstance(html_content, str):
+        # Pre-screen the head of the document (scripts/link tags live there);
+        # most crawled pages mention none of the tokens, so we can skip the
+        # tree build entirely.
+        lower = html_content[:65536].lower()
+        has_swagger = 'swagger' in lower
+        has_redoc = 'redoc' in lower
+        has_postman = 'postman' in lower
+        if not (has_swagger or has_redoc or has_postman):
+            return DocTypeResult("unknown", 0.0)
+    else:
+        has_swagger = has_redoc = has_postman = True
+
+    if isinstance(html_content, str) and LexborHTMLParser is not None:
+        return _detect_with_selectolax(html_content,
+                                       has_swagger, has_redoc, has_postman)
+
+    soup = _as_soup(html_content)
+
+    # 1. Look for Swagger / OpenAPI references
+    if has_swagger or has_redoc:
+        swagger_ui = soup.find('script', src=_RE_SWAGGER_UI) if has_swagger else None
+        redoc = soup.find('script', src=_RE_REDOC) if has_redoc else None
+        if swagger_ui or redoc:
+            return DocTypeResult("openapi", 0.9)
+
+        if has_swagger and soup.find(id='swagger-ui'):
+            return DocTypeResult("swagger", 0.8)
+
+    # 2. Look for Postman references
+    if has_postman:
+        if soup.find('a', href=_RE_POSTMAN_HREF):
+            return DocTypeResult("postman", 0.7)
+
+        if soup.find('img', alt=_RE_POSTMAN_ALT):
+            return DocTypeResult("postman", 0.6)
+
+    return DocTypeResult("unknown", 0.0)
+
+def _detect_with_selectolax(html_content: str, has_swagger: bool,
+                            has_redoc: bool, has_postman: bool) -> DocTypeResult:
+    """
+    selectolax-backed doc-type probes, mirroring the BeautifulSoup checks.
+
+    Attribute values are matched in Python since lexbor lacks the
+    case-insensitive selector flag.
+    """
+    tree = LexborHTMLParser(html_content)
 
     # 1. Look for Swagger / OpenAPI references
-    swagger_ui = soup.find('script', src=re.compile(r'swagger-ui', re.IGNORECASE))
-    redoc = soup.find('script', src=re.compile(r'redoc', re.IGNORECASE))
-    if swagger_ui or redoc:
-        confidence = 0.9
-        return DocTypeResult("openapi", confidence)
+    if has_swagger or has_redoc:
+        for node in tree.css('script[src]'):
+            src = (node.attributes.get('src') or '').lower()
+            if (has_swagger and 'swagger-ui' in src) or \
+                    (has_redoc and 'redoc' in src):
+                return DocTypeResult("openapi", 0.9)
 
-    swagger_div = soup.find(id='swagger-ui')
-    if swagger_div:
-        confidence = 0.8
-        return DocTypeResult("swagger", confidence)
+        if has_swagger and tree.css_first('#swagger-ui') is not None:
+            return DocTypeResult("swagger", 0.8)
 
     # 2. Look for Postman references
-    postman_link = soup.find('a', href=re.compile(r'getpostman|documenter\.getpostman\.com', re.IGNORECASE))
-    if postman_link:
-        confidence = 0.7
-        return DocTypeResult("postman", confidence)
+    if has_postman:
+        for node in tree.css('a[href]'):
+            if 'getpostman' in (node.attributes.get('href') or '').lower():
+                return DocTypeResult("postman", 0.7)
 
-    run_in_postman = soup.find('img', alt=re.compile(r'Run in Postman', re.IGNORECASE))
-    if run_in_postman:
-        confidence = 0.6
-        return DocTypeResult("postman", confidence)
+        for node in tree.css('img[alt]'):
+            if 'run in postman' in (node.attributes.get('alt') or '').lower():
+                return DocTypeResult("postman", 0.6)
 
     return DocTypeResult("unknown", 0.0)
 
-def extract_doc_links(html_content: str, base_url: str) -> Set[str]:
+def extract_doc_links(html_content: Union[str, BeautifulSoup, "lxml_html.HtmlElement"],
+                      base_url: str) -> Set[str]:
     """
     Extract all documentation page links from HTML content.
-    
+
     Args:
-        html_content: Raw HTML content to search
+        html_content: Raw HTML content or an already-parsed tree
+            (BeautifulSoup or lxml)
         base_url: Base URL to resolve relative URLs
-        
+
     Returns:
         Set[str]: Set of absolute URLs for documentation pages
     """
-    if not html_content or not base_url:
+    if html_content is None or not base_url:
+        return set()
+
+    if isinstance(html_content, BeautifulSoup):
+        return _extract_doc_links_soup(html_content, base_url)
+
+    if isinstance(html_content, lxml_html.HtmlElement):
+        return _extract_doc_links_lxml(html_content, base_url)
+
+    if not html_content:
         return set()
 
-    soup = BeautifulSoup(html_content, 'html.parser')
+    try:
+        doc = lxml_html.fromstring(html_content)
+    except Exception:
+        return _extract_doc_links_soup(_make_soup(html_content), base_url)
+
+    return _extract_doc_links_lxml(doc, base_url)
+
+def _extract_doc_links_lxml(doc: "lxml_html.HtmlElement",
+                            base_url: str) -> Set[str]:
+    """lxml/XPath variant of extract_doc_links."""
+    links = set()
+    base_domain = urlparse(base_url).netloc
+
+    # First try to find sidebar/menu links
+    for href in doc.xpath(_XPATH_SIDEBAR_LINKS):
+        url = urljoin(base_url, href)
+        if urlparse(url).netloc == base_domain:
+            links.add(url)
+
+    # If no links found in sidebar, fall back to nav elements and main content
+    if not links:
+        for href in doc.xpath(_XPATH_ALL_LINKS):
+            url = urljoin(base_url, href)
+            if urlparse(url).netloc == base_domain:
+                links.add(url)
+            else:
+                print(f"Skipping link: {url}")
+
+    return links
+
+def _extract_doc_links_soup(soup: BeautifulSoup, base_url: str) -> Set[str]:
+    """BeautifulSoup variant of extract_doc_links for pre-built trees."""
     links = set()
     base_domain = urlparse(base_url).netloc
 
     # First try to find sidebar/menu
-    sidebar = soup.find(['aside', 'div', 'nav'], 
-                       class_=re.compile(r'sidebar|menu|navigation', re.IGNORECASE))
-    
+    sidebar = soup.find(['aside', 'div', 'nav'],
+                       class_=_RE_NAV_CLASS)
+
     if sidebar:
         for a in sidebar.find_all('a', href=True):
             url = urljoin(base_url, a['href'])
             if urlparse(url).netloc == base_domain:
                 links.add(url)
-                    
+
     # If no links found in sidebar, fall back to searching nav elements and main content
     if not links:
         # Common documentation navigation elements
         nav_elements = soup.find_all(['nav', 'div'])
-        
+
         for nav in nav_elements:
             for a in nav.find_all('a', href=True):
                 url = urljoin(base_url, a['href'])
@@ -105,8 +316,8 @@ def extract_doc_links(html_content: str, base_url: str) -> Set[str]:
                     print(f"Skipping link: {url}")
 
         # Also look for links in main content area
-        main_content = soup.find(['main', 'article', 'div'], 
-                               class_=re.compile(r'content|main|documentation', re.IGNORECASE))
+        main_content = soup.find(['main', 'article', 'div'],
+                               class_=_RE_CONTENT_CLASS)
         if main_content:
             for a in main_content.find_all('a', href=True):
                 url = urljoin(base_url, a['href'])
@@ -115,153 +326,279 @@ def extract_doc_links(html_content: str, base_url: str) -> Set[str]:
 
     return links
 
-def find_spec_link(html_content: str, base_url: str) -> Optional[str]:
+def find_spec_link(html_content: str, base_url: str,
+                   soup: Optional[BeautifulSoup] = None) -> Optional[str]:
     """
     Attempt to find a direct link to the underlying API spec file.
-    
+
     Args:
         html_content: Raw HTML content to search
         base_url: Base URL to resolve relative URLs
-        
+        soup: Optional pre-parsed tree of html_content, to avoid reparsing
+
     Returns:
         Optional[str]: Absolute URL of the spec if found, None otherwise
     """
     if not html_content or not base_url:
         return None
 
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Fast path: scan src/href attributes in the raw text, no tree needed
+    for m in _RE_SPEC_ANY.finditer(html_content):
+        try:
+            return urljoin(base_url, m.group(1))
+        except Exception:
+            continue
+
+    # Absolute spec URLs embedded outside src/href attributes (e.g. in JS)
+    match = _RE_COMBINED_SPEC.search(html_content)
+    if match:
+        return match.group(0)
 
-    patterns = [
-        r'swagger\.json',
-        r'openapi\.json',
-        r'openapi\.ya?ml',
-        r'postman_collection\.json'
-    ]
+    # Only fall back to a tree walk when the page even mentions a spec
+    lower = html_content.lower()
+    if not any(token in lower for token in ('swagger', 'openapi', 'postman')):
+        return None
 
-    # Search in script, link and anchor tags
-    for tag_type, attr in [('script', 'src'), ('link', 'href'), ('a', 'href')]:
-        for tag in soup.find_all(tag_type, {attr: True}):
-            url = tag.get(attr, '')
-            if any(re.search(pattern, url, re.IGNORECASE) for pattern in patterns):
+    if soup is not None:
+        # Search script, link and anchor tags of the pre-built tree in a
+        # single selector walk
+        for tag in soup.select('script[src], link[href], a[href]'):
+            url = tag.get('src') or tag.get('href') or ''
+            if _RE_SPEC_PATH.search(url):
                 try:
                     return urljoin(base_url, url)
                 except Exception:
                     continue
+        return None
+
+    # One C-level traversal over all script/link/anchor URLs
+    try:
+        doc = lxml_html.fromstring(html_content)
+    except Exception:
+        return None
 
-    # Fallback: Search entire HTML
-    combined_pattern = r'https?://[^"\'<>\s]+(?:swagger\.json|openapi\.(?:json|ya?ml)|postman_collection\.json)'
-    match = re.search(combined_pattern, html_content, re.IGNORECASE)
-    return match.group(0) if match else None
+    for candidate in doc.xpath(_XPATH_SPEC_CANDIDATES):
+        if _RE_SPEC_PATH.search(candidate):
+            try:
+                return urljoin(base_url, candidate)
+            except Exception:
+                continue
 
-def retrieve_api_spec(spec_url: str) -> Optional[str]:
+    return None
+
+def _looks_like_yaml(spec_url: str, content_type: str = '') -> bool:
+    """Guess whether a spec is YAML from its content type or URL extension."""
+    if 'yaml' in content_type or 'yml' in content_type:
+        return True
+    return urlparse(spec_url).path.lower().endswith(('.yaml', '.yml'))
+
+def retrieve_api_spec(spec_url: str) -> Tuple[Optional[str], bool]:
     """
     Download the spec file from the given URL.
-    
+
     Args:
         spec_url: URL to fetch the spec from
-        
+
     Returns:
-        Optional[str]: Raw text of the spec if successful, None otherwise
+        Tuple[Optional[str], bool]: Raw text of the spec (or None on
+        failure) and whether it looks like YAML rather than JSON
     """
     if not spec_url:
-        return None
-        
+        return None, False
+
+    with _SPEC_CACHE_LOCK:
+        cached = _SPEC_CACHE.get(spec_url)
+    if cached is not None:
+        return cached
+
     try:
-        resp = requests.get(spec_url, timeout=10)
+        resp = _SESSION.get(spec_url, timeout=10, stream=True)
         resp.raise_for_status()
-        return resp.text
+
+        # Bail out before allocating anything for oversized responses
+        content_length = resp.headers.get('Content-Length')
+        if content_length and int(content_length) > _SPEC_MAX_BYTES:
+            print(f"Spec at {spec_url} exceeds {_SPEC_MAX_BYTES} bytes, skipping")
+            return None, False
+
+        buffer = bytearray()
+        for chunk in resp.iter_content(chunk_size=_SPEC_CHUNK_BYTES,
+                                       decode_unicode=False):
+            buffer.extend(chunk)
+            if len(buffer) > _SPEC_MAX_BYTES:
+                print(f"Spec at {spec_url} exceeds {_SPEC_MAX_BYTES} bytes, skipping")
+                return None, False
+
+        content_type = resp.headers.get('Content-Type', '').lower()
+        # Decode once at the end; specs are JSON/YAML, so default to UTF-8
+        # unless the server declared a charset
+        encoding = resp.encoding if 'charset' in content_type else 'utf-8'
+        text = bytes(buffer).decode(encoding or 'utf-8', errors='replace')
+
+        result = text, _looks_like_yaml(spec_url, content_type)
+        if len(text) <= _SPEC_CACHE_MAX_BYTES:
+            with _SPEC_CACHE_LOCK:
+                _SPEC_CACHE[spec_url] = result
+        return result
     except (requests.RequestException, Exception) as e:
         print(f"Failed to retrieve spec from {spec_url}: {e}")
-        return None
+        return None, False
 
-def parse_api_spec(spec_text: Optional[str]) -> Optional[Dict[str, Any]]:
+def parse_api_spec(spec_text: Optional[str],
+                   is_yaml: bool = False) -> Tuple[Optional[Dict[str, Any]], bool]:
     """
     Parse the spec text as JSON or YAML.
-    
+
     Args:
         spec_text: Raw text to parse
-        
+        is_yaml: Skip the JSON attempt when the source is known to be YAML
+
     Returns:
-        Optional[Dict]: Parsed spec as dictionary if successful, None otherwise
+        Tuple[Optional[Dict], bool]: the parsed spec (or None) and whether
+        the source text was JSON
     """
     if not spec_text:
-        return None
+        return None, False
 
     # Try JSON first
-    try:
-        return json.loads(spec_text)
-    except json.JSONDecodeError:
-        pass
+    if not is_yaml:
+        try:
+            return orjson.loads(spec_text), True
+        except orjson.JSONDecodeError:
+            pass
 
     # Try YAML as fallback
     try:
-        return yaml.safe_load(spec_text)
+        return yaml.load(spec_text, Loader=_YamlLoader), False
     except yaml.YAMLError:
         pass
 
-    return None
+    return None, False
 
-def reconstruct_definition(spec_dict: Optional[Dict[str, Any]], doc_type: str) -> Optional[str]:
+def reconstruct_definition(spec_dict: Optional[Dict[str, Any]], doc_type: str,
+                           *, raw_text: Optional[str] = None,
+                           was_json: bool = False) -> Optional[str]:
     """
     Convert spec dictionary to canonical JSON format.
-    
+
     Args:
         spec_dict: Parsed spec dictionary
         doc_type: Type of documentation ("openapi", "swagger", "postman")
-        
+        raw_text: Original spec source, if available
+        was_json: Whether raw_text is already JSON
+
     Returns:
         Optional[str]: JSON string if successful, None otherwise
     """
     if not spec_dict:
         return None
 
+    # A JSON source is already canonical; serve it as-is instead of
+    # traversing and re-serializing the whole parsed tree
+    if was_json and raw_text:
+        return raw_text
+
+    try:
+        return orjson.dumps(spec_dict, option=orjson.OPT_INDENT_2).decode()
+    except (TypeError, ValueError):
+        # orjson rejects some types the stdlib handles (e.g. oversized ints)
+        pass
+
     try:
         return json.dumps(spec_dict, indent=2)
     except (TypeError, ValueError) as e:
         print(f"Failed to serialize spec: {e}")
         return None
 
+# Indicators that the rendered page exposes an API spec; waiting for one of
+# these bounds the dynamic fetch to actual content readiness instead of
+# network idle, which analytics/long-poll sockets often never reach.
+_PW_SPEC_SELECTOR = (
+    'script[src*="swagger-ui"], #swagger-ui, a[href*="postman"], '
+    'script:has-text("swagger.json"), script:has-text("openapi.json")')
+
+# Only HTML/JS matters for spec discovery; skip heavy static assets
+_PW_BLOCKED_RESOURCES = ('image', 'font', 'media')
+
+# Shared Playwright state. The sync API is bound to the thread that starts
+# it, so the browser is cached per thread: each crawl worker pays the
+# Chromium launch once instead of once per URL.
+_PW_LOCAL = threading.local()
+_PW_OPEN: List[Tuple[Any, Browser]] = []
+_PW_OPEN_LOCK = threading.Lock()
+
+def _get_browser() -> Browser:
+    """
+    Return this thread's shared Chromium instance, launching it on first use.
+    """
+    browser = getattr(_PW_LOCAL, 'browser', None)
+    if browser is None or not browser.is_connected():
+        pw = sync_playwright().start()
+        browser = pw.chromium.launch(headless=True)
+        _PW_LOCAL.pw = pw
+        _PW_LOCAL.browser = browser
+        with _PW_OPEN_LOCK:
+            _PW_OPEN.append((pw, browser))
+    return browser
+
+def _close_browsers() -> None:
+    """Best-effort shutdown of every launched browser and driver."""
+    with _PW_OPEN_LOCK:
+        open_instances = list(_PW_OPEN)
+        _PW_OPEN.clear()
+    for pw, browser in open_instances:
+        try:
+            browser.close()
+            pw.stop()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+atexit.register(_close_browsers)
+
 def fetch_html_dynamic(url: str) -> Optional[str]:
     """
     Fetch rendered HTML using Playwright with improved timeout handling.
+
+    Reuses a shared browser; each call gets a fresh context and page.
     """
-    browser: Optional[Browser] = None
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page: Page = browser.new_page()
-            
-            # Try different wait strategies in order
-            try:
-                # First attempt: Wait for DOMContentLoaded with longer timeout
-                page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            except Exception as e:
-                print(f"Initial load failed, trying with load event: {e}")
-                # Second attempt: Wait for load event
-                page.goto(url, wait_until='load', timeout=60000)
-            
-            # Wait additional time for any critical elements if needed
+        browser = _get_browser()
+        context = browser.new_context()
+        try:
+            page: Page = context.new_page()
+
+            # Skip images/fonts/media; only HTML and JS matter here
+            page.route('**/*', lambda route: route.abort()
+                       if route.request.resource_type in _PW_BLOCKED_RESOURCES
+                       else route.continue_())
+
+            # DOM-ready is enough; network idle often never fires on doc
+            # sites with long-poll/analytics connections
+            page.goto(url, wait_until='domcontentloaded', timeout=15000)
+
+            # Give spec indicators a short window to render
             try:
-                # Adjust selector based on the specific page structure
-                page.wait_for_selector('main, article, .content, #swagger-ui', timeout=10000)
+                page.wait_for_selector(_PW_SPEC_SELECTOR, timeout=5000)
             except Exception:
                 # Continue even if specific elements aren't found
                 pass
-            
-            html_content = page.content()
-            browser.close()
-            browser = None
-            return html_content
-            
+
+            return page.content()
+        finally:
+            context.close()
+
     except Exception as e:
         print(f"Playwright error when fetching {url}: {e}")
         return None
-    finally:
-        if browser:
-            try:
-                browser.close()
-            except Exception as e:
-                print(f"Error closing browser: {e}")
+
+def _static_html_sufficient(url: str, html_content: str) -> bool:
+    """
+    Decide whether a statically fetched page is worth keeping: it either
+    links to further documentation pages or carries a spec link itself.
+    """
+    if extract_doc_links(html_content, url):
+        return True
+    return find_spec_link(html_content, url) is not None
 
 def fetch_documentation_html(url: str, use_playwright: bool = False) -> Optional[str]:
     """
@@ -277,108 +614,387 @@ def fetch_documentation_html(url: str, use_playwright: bool = False) -> Optional
     if not url:
         return None
 
+    cache_key = (url, use_playwright)
+    with _HTML_CACHE_LOCK:
+        cached = _HTML_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    static_html = None
+    html_content = None
+
     # Try requests first
     try:
-        resp = requests.get(url, timeout=10)
+        resp = _SESSION.get(url, timeout=10)
         resp.raise_for_status()
-        html_content = resp.text
-        
-        # Check if we can find any documentation links
-        doc_links = extract_doc_links(html_content, url)
-        
-        if doc_links:
-            return html_content
-            
+        static_html = resp.text
+
+        if _static_html_sufficient(url, static_html):
+            html_content = static_html
+
     except requests.RequestException as e:
         print(f"Requests failed for {url}: {e}")
-        
-    if use_playwright:
+
+    if html_content is None and use_playwright:
         print("No documentation links found. Trying Playwright for dynamic rendering...")
-        return fetch_html_dynamic(url)
+        html_content = fetch_html_dynamic(url)
 
-    return None
+    # Fall back to the static HTML rather than discarding a good fetch
+    if html_content is None:
+        html_content = static_html
+
+    if html_content:
+        with _HTML_CACHE_LOCK:
+            _HTML_CACHE[cache_key] = html_content
+
+    return html_content
+
+def _extract_title(tree: Union[BeautifulSoup, "lxml_html.HtmlElement"]) -> str:
+    """Pull the page title out of a parsed page (BeautifulSoup or lxml)."""
+    if isinstance(tree, BeautifulSoup):
+        title_elem = tree.find(['h1', 'title'])
+        if title_elem:
+            return title_elem.get_text(strip=True)
+        return ""
+
+    nodes = tree.xpath('(//h1 | //title)[1]')
+    if nodes:
+        return nodes[0].text_content().strip()
+    return ""
 
-def parse_doc_page(url: str, html_content: str) -> DocPage:
+def _extract_main_content(html_content: str,
+                          soup: Optional[BeautifulSoup] = None) -> str:
+    """
+    Bounded text of the main content area, capped at _MAX_CONTENT_BYTES.
+
+    Uses lxml's C-level text_content(); falls back to the BeautifulSoup
+    walk for markup lxml rejects.
+    """
+    try:
+        doc = lxml_html.fromstring(html_content)
+        nodes = doc.xpath(_XPATH_MAIN_CONTENT)
+        if nodes:
+            return nodes[0].text_content().strip()[:_MAX_CONTENT_BYTES]
+        return ""
+    except Exception:
+        pass
+
+    if soup is None:
+        soup = _make_soup(html_content)
+    main_content = soup.find(['main', 'article', 'div'],
+                             class_=_RE_CONTENT_CLASS)
+    if main_content:
+        return main_content.get_text(strip=True)[:_MAX_CONTENT_BYTES]
+    return ""
+
+def parse_doc_page(url: str, html_content: str,
+                   soup: Optional[BeautifulSoup] = None,
+                   extract_content: bool = False) -> DocPage:
     """
     Parse a single documentation page.
-    
+
     Args:
         url: Page URL
         html_content: HTML content
-        
+        soup: Optional pre-parsed tree of html_content, to avoid reparsing
+        extract_content: Also extract the main content text; off by
+            default since crawl callers only use the spec
+
     Returns:
         DocPage: Parsed page information
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Try to find title
-    title = ""
-    title_elem = soup.find(['h1', 'title'])
-    if title_elem:
-        title = title_elem.get_text(strip=True)
-    
-    # Try to find main content
+    if soup is None:
+        soup = _make_soup(html_content)
+
+    title = _extract_title(soup)
     content = ""
-    main_content = soup.find(['main', 'article', 'div'], 
-                           class_=re.compile(r'content|main|documentation', re.IGNORECASE))
-    if main_content:
-        content = main_content.get_text(strip=True)
-    
+    if extract_content:
+        content = _extract_main_content(html_content, soup)
+
     # Look for API spec
-    spec_url = find_spec_link(html_content, url)
+    spec_url = find_spec_link(html_content, url, soup=soup)
     spec = None
+    spec_text = None
+    spec_is_json = False
     if spec_url:
-        spec_text = retrieve_api_spec(spec_url)
+        spec_text, is_yaml = retrieve_api_spec(spec_url)
         if spec_text:
-            spec = parse_api_spec(spec_text)
-            
-    return DocPage(url=url, title=title, content=content, spec=spec)
+            spec, spec_is_json = parse_api_spec(spec_text, is_yaml=is_yaml)
+
+    return DocPage(url=url, title=title, content=content, spec=spec,
+                   spec_text=spec_text, spec_is_json=spec_is_json)
 
-def parse_api_documentation(url: str, use_playwright
-                            
-                            : bool = False) -> List[DocPage]:
+def _canonicalize(url: str) -> str:
     """
-    Main function to parse API documentation by crawling all pages.
-    
+    Normalize a URL into a visited-set key: drop the fragment, lowercase
+    the scheme and host, and strip a trailing slash so https://x/a,
+    https://x/a/ and https://x/a#section count as one page.
+
+    Keys only — pages are fetched under their original URL, since the
+    slash-stripped form would break relative-link resolution and force a
+    redirect on servers that 301 to the slash form.
+    """
+    try:
+        parts = urlparse(url)
+    except ValueError:
+        return url
+
+    canonical = parts._replace(scheme=parts.scheme.lower(),
+                               netloc=parts.netloc.lower(),
+                               fragment='').geturl()
+    if canonical.endswith('/'):
+        canonical = canonical[:-1]
+    return canonical
+
+async def _afetch(session: "aiohttp.ClientSession", url: str) -> Optional[str]:
+    """
+    Fetch a URL on the shared aiohttp session, returning text or None.
+
+    Streams the body in chunks and rejects oversized responses, mirroring
+    the cap in retrieve_api_spec.
+    """
+    try:
+        async with session.get(
+                url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            resp.raise_for_status()
+
+            # Bail out before allocating anything for oversized responses
+            if resp.content_length and resp.content_length > _SPEC_MAX_BYTES:
+                print(f"Response from {url} exceeds {_SPEC_MAX_BYTES} bytes, skipping")
+                return None
+
+            buffer = bytearray()
+            async for chunk in resp.content.iter_chunked(_SPEC_CHUNK_BYTES):
+                buffer.extend(chunk)
+                if len(buffer) > _SPEC_MAX_BYTES:
+                    print(f"Response from {url} exceeds {_SPEC_MAX_BYTES} bytes, skipping")
+                    return None
+
+            try:
+                encoding = resp.get_encoding()
+            except RuntimeError:
+                encoding = 'utf-8'
+            return bytes(buffer).decode(encoding or 'utf-8', errors='replace')
+    except Exception as e:
+        print(f"Fetch failed for {url}: {e}")
+        return None
+
+async def _afetch_documentation_html(
+        session: "aiohttp.ClientSession", url: str, use_playwright: bool
+) -> Tuple[Optional[str], Optional["lxml_html.HtmlElement"]]:
+    """
+    Async counterpart of fetch_documentation_html: static fetch first, then
+    optionally Playwright (run on an executor thread, since it is sync).
+
+    Returns the HTML together with the lxml tree built for the sufficiency
+    check (None for dynamic renders and cache hits), so callers do not
+    reparse the page.
+    """
+    cache_key = (url, use_playwright)
+    with _HTML_CACHE_LOCK:
+        cached = _HTML_CACHE.get(cache_key)
+    if cached is not None:
+        return cached, None
+
+    static_html = await _afetch(session, url)
+    static_doc = None
+    html_content = None
+    doc = None
+    if static_html:
+        try:
+            static_doc = lxml_html.fromstring(static_html)
+        except Exception:
+            static_doc = None
+
+        sufficient = extract_doc_links(
+            static_doc if static_doc is not None else static_html, url
+        ) or find_spec_link(static_html, url) is not None
+        if sufficient:
+            html_content, doc = static_html, static_doc
+
+    if html_content is None and use_playwright:
+        print("No documentation links found. Trying Playwright for dynamic rendering...")
+        loop = asyncio.get_running_loop()
+        html_content = await loop.run_in_executor(None, fetch_html_dynamic, url)
+
+    # Fall back to the static HTML rather than discarding a good fetch
+    if html_content is None:
+        html_content, doc = static_html, static_doc
+
+    if html_content:
+        with _HTML_CACHE_LOCK:
+            _HTML_CACHE[cache_key] = html_content
+
+    return html_content, doc
+
+async def _afetch_spec(session: "aiohttp.ClientSession",
+                       spec_url: str) -> Tuple[Optional[str], bool]:
+    """
+    Async spec download sharing the cache (and size cap via _afetch) with
+    retrieve_api_spec.
+    """
+    with _SPEC_CACHE_LOCK:
+        cached = _SPEC_CACHE.get(spec_url)
+    if cached is not None:
+        return cached
+
+    spec_text = await _afetch(session, spec_url)
+    if spec_text is None:
+        return None, False
+
+    result = spec_text, _looks_like_yaml(spec_url)
+    if len(spec_text) <= _SPEC_CACHE_MAX_BYTES:
+        with _SPEC_CACHE_LOCK:
+            _SPEC_CACHE[spec_url] = result
+    return result
+
+async def parse_api_documentation_async(url: str,
+                                        use_playwright: bool = False) -> List[DocPage]:
+    """
+    Crawl all documentation pages reachable from url, fetching concurrently.
+
     Args:
         url: Documentation homepage URL
         use_playwright: Whether to try Playwright for dynamic content
-        
+
     Returns:
         List[DocPage]: List of parsed documentation pages
     """
     if not url:
         return []
 
-    visited_urls = set()
-    pages_to_visit = {url}
-    parsed_pages = []
-
-    while pages_to_visit:
-        current_url = pages_to_visit.pop()
-        if current_url in visited_urls:
-            continue
-            
-        visited_urls.add(current_url)
-        print(f"Processing page: {current_url}")
-
-        html_content = fetch_documentation_html(current_url, use_playwright)
-        if not html_content:
-            print(f"Could not fetch HTML content for {current_url}")
-            continue
+    # Visited bookkeeping is keyed on the canonical form; the frontier
+    # carries the original URLs so fetches and relative links stay intact
+    visited_urls: Set[str] = {_canonicalize(url)}
+    parsed_pages: List[DocPage] = []
+    frontier: "asyncio.Queue[str]" = asyncio.Queue()
+    frontier.put_nowait(url)
+    fetch_limit = asyncio.Semaphore(_ASYNC_FETCH_LIMIT)
 
-        # Parse current page
-        doc_page = parse_doc_page(current_url, html_content)
-        parsed_pages.append(doc_page)
+    connector = aiohttp.TCPConnector(limit_per_host=8, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
 
-        # Extract links to other documentation pages
-        new_links = extract_doc_links(html_content, current_url)
-        print(f"Found {len(new_links)} new links")
-        pages_to_visit.update(new_links - visited_urls)
+        async def worker() -> None:
+            while True:
+                current_url = await frontier.get()
+                try:
+                    print(f"Processing page: {current_url}")
+                    async with fetch_limit:
+                        html_content, doc = await _afetch_documentation_html(
+                            session, current_url, use_playwright)
+                    if not html_content:
+                        print(f"Could not fetch HTML content for {current_url}")
+                        continue
+
+                    # Reuse the tree from the sufficiency check; pages that
+                    # arrived without one (dynamic renders) are parsed once
+                    # here, with BeautifulSoup as the fallback parser
+                    if doc is None:
+                        try:
+                            doc = lxml_html.fromstring(html_content)
+                        except Exception:
+                            doc = None
+                    tree = doc if doc is not None else _make_soup(html_content)
+
+                    # Parse current page; the crawl only cares about specs,
+                    # so skip the content walk entirely
+                    title = _extract_title(tree)
+                    content = ""
+                    spec = None
+                    spec_text = None
+                    spec_is_json = False
+                    spec_url = find_spec_link(
+                        html_content, current_url,
+                        soup=tree if isinstance(tree, BeautifulSoup) else None)
+                    if spec_url:
+                        spec_text, is_yaml = await _afetch_spec(session, spec_url)
+                        if spec_text:
+                            spec, spec_is_json = parse_api_spec(
+                                spec_text, is_yaml=is_yaml)
+                    parsed_pages.append(DocPage(url=current_url, title=title,
+                                                content=content, spec=spec,
+                                                spec_text=spec_text,
+                                                spec_is_json=spec_is_json))
+
+                    # Extract links to other documentation pages from the
+                    # same tree
+                    new_links = extract_doc_links(tree, current_url)
+                    print(f"Found {len(new_links)} new links")
+                    for link in new_links:
+                        canonical = _canonicalize(link)
+                        if canonical in visited_urls:
+                            continue
+                        if len(visited_urls) >= _MAX_CRAWL_PAGES:
+                            break
+                        visited_urls.add(canonical)
+                        frontier.put_nowait(link)
+                except Exception as e:
+                    # One bad page must not kill the worker (and, once all
+                    # workers are gone, hang frontier.join())
+                    print(f"Failed to process {current_url}: {e}")
+                finally:
+                    frontier.task_done()
+
+        workers = [asyncio.create_task(worker())
+                   for _ in range(_ASYNC_FETCH_LIMIT)]
+        await frontier.join()
+        for task in workers:
+            task.cancel()
 
     print(f"visited_urls: {visited_urls}")
     return parsed_pages
 
+def parse_api_documentation(url: str, use_playwright: bool = False) -> List[DocPage]:
+    """
+    Main function to parse API documentation by crawling all pages.
+
+    Args:
+        url: Documentation homepage URL
+        use_playwright: Whether to try Playwright for dynamic content
+
+    Returns:
+        List[DocPage]: List of parsed documentation pages
+    """
+    if not url:
+        return []
+
+    return asyncio.run(parse_api_documentation_async(url, use_playwright))
+
+def parse_api_definition(url: str,
+                         use_playwright: bool = False) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Crawl the documentation at url and return the first API spec found.
+
+    Args:
+        url: Documentation homepage URL
+        use_playwright: Whether to try Playwright for dynamic content
+
+    Returns:
+        Tuple of (doc_type, definition): the detected spec flavour and its
+        canonical JSON text, or (None, None) if no spec was found
+    """
+    pages = parse_api_documentation(url, use_playwright)
+    # JSON/YAML can parse to any value; only a mapping can be a spec
+    spec_page = next(
+        (page for page in pages if isinstance(page.spec, dict) and page.spec),
+        None)
+    if spec_page is None:
+        return None, None
+    spec = spec_page.spec
+
+    if 'openapi' in spec:
+        doc_type = "openapi"
+    elif 'swagger' in spec:
+        doc_type = "swagger"
+    elif isinstance(spec.get('info'), dict) and '_postman_id' in spec['info']:
+        doc_type = "postman"
+    else:
+        doc_type = "unknown"
+
+    return doc_type, reconstruct_definition(spec, doc_type,
+                                            raw_text=spec_page.spec_text,
+                                            was_json=spec_page.spec_is_json)
+
 if __name__ == "__main__":
     test_url = "https://api-docs.quiqup.com/docs/api-documentation/d5c50ad25bbc8-ecommerce-api"
     doc_pages = parse_api_documentation(test_url, use_playwright=True)
@@ -0,0 +1,105 @@
+import unittest
+from unittest.mock import patch
+from integuru.util.doc_page_parser import (
+    DocPage,
+    detect_documentation_type,
+    extract_doc_links,
+    find_spec_link,
+    parse_api_definition,
+    parse_api_spec,
+    reconstruct_definition,
+    _canonicalize,
+    _make_soup,
+)
+
+SWAGGER_HTML = """
+<html><head><script src="/assets/swagger-ui-bundle.js"></script></head>
+<body><div id="swagger-ui"></div></body></html>
+"""
+
+POSTMAN_HTML = """
+<html><body><a href="https://documenter.getpostman.com/view/123">docs</a></body></html>
+"""
+
+DOC_PAGE_HTML = """
+<html><body>
+<nav class="sidebar">
+  <a href="/docs/intro">Intro</a>
+  <a href="/docs/auth">Auth</a>
+  <a href="https://other.example.com/external">External</a>
+</nav>
+<main class="content">
+  <h1>API Reference</h1>
+  <a href="/openapi.json">Download spec</a>
+</main>
+</body></html>
+"""
+
+class TestDocPageParser(unittest.TestCase):
+
+    def test_detect_documentation_type_swagger(self):
+        result = detect_documentation_type(SWAGGER_HTML)
+        self.assertEqual(result.doc_type, "openapi")
+        self.assertGreater(result.confidence, 0.5)
+
+    def test_detect_documentation_type_postman(self):
+        result = detect_documentation_type(POSTMAN_HTML)
+        self.assertEqual(result.doc_type, "postman")
+
+    def test_detect_documentation_type_unknown(self):
+        result = detect_documentation_type("<html><body>plain page</body></html>")
+        self.assertEqual(result.doc_type, "unknown")
+        self.assertEqual(result.confidence, 0.0)
+
+    def test_detect_documentation_type_accepts_soup(self):
+        result = detect_documentation_type(_make_soup(SWAGGER_HTML))
+        self.assertEqual(result.doc_type, "openapi")
+
+    def test_extract_doc_links_same_domain_only(self):
+        links = extract_doc_links(DOC_PAGE_HTML, "https://api.example.com/docs")
+        self.assertIn("https://api.example.com/docs/intro", links)
+        self.assertIn("https://api.example.com/docs/auth", links)
+        self.assertNotIn("https://other.example.com/external", links)
+
+    def test_find_spec_link_resolves_relative_url(self):
+        spec_url = find_spec_link(DOC_PAGE_HTML, "https://api.example.com/docs")
+        self.assertEqual(spec_url, "https://api.example.com/openapi.json")
+
+    def test_find_spec_link_none_when_absent(self):
+        self.assertIsNone(find_spec_link("<html><body></body></html>",
+                                         "https://api.example.com"))
+
+    def test_canonicalize_collapses_url_variants(self):
+        base = _canonicalize("https://API.Example.com/docs")
+        self.assertEqual(_canonicalize("https://api.example.com/docs#auth"), base)
+        self.assertEqual(_canonicalize("https://api.example.com/docs/"), base)
+
+    def test_parse_api_spec_json(self):
+        spec, was_json = parse_api_spec('{"openapi": "3.0.0"}')
+        self.assertEqual(spec["openapi"], "3.0.0")
+        self.assertTrue(was_json)
+
+    def test_parse_api_spec_yaml(self):
+        spec, was_json = parse_api_spec("openapi: 3.0.0\ninfo:\n  title: Test")
+        self.assertEqual(spec["info"]["title"], "Test")
+        self.assertFalse(was_json)
+
+    def test_reconstruct_definition_round_trip(self):
+        text = reconstruct_definition({"openapi": "3.0.0"}, "openapi")
+        self.assertIn('"openapi"', text)
+
+    def test_parse_api_definition_ignores_non_dict_specs(self):
+        pages = [DocPage(url="u", title="", content="",
+                         spec=["not", "a", "spec"], spec_text="[1]")]
+        with patch('integuru.util.doc_page_parser.parse_api_documentation',
+                   return_value=pages):
+            self.assertEqual(parse_api_definition("https://x.com"), (None, None))
+
+    def test_reconstruct_definition_serves_json_source_directly(self):
+        raw = '{"openapi": "3.0.0"}'
+        text = reconstruct_definition({"openapi": "3.0.0"}, "openapi",
+                                      raw_text=raw, was_json=True)
+        self.assertEqual(text, raw)
+
+if __name__ == '__main__':
+    unittest.main()